@@ -23,12 +23,23 @@
 import os
 import sys
 import shutil
+import stat
 import subprocess
 import tkinter as tk
 from tkinter import messagebox, ttk
 import platform
 import ctypes
 import math
+import itertools
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the gradient falls back to pure Python
+    np = None
 
 # ----- Configuration: adjust paths/profiles as needed -----
 BROWSER_PROFILES = {
@@ -36,10 +47,18 @@ BROWSER_PROFILES = {
     'edge': os.path.expanduser(r'~\AppData\Local\Microsoft\Edge\User Data\Default'),
     'firefox': os.path.expanduser(r'~\AppData\Roaming\Mozilla\Firefox\Profiles')
 }
+# Chrome/Edge profile entries holding history, cookies, saved logins and cache
+BROWSER_DATA_ENTRIES = frozenset({'History', 'Cookies', 'Login Data', 'Cache'})
 GIT_DESKTOP_CREDENTIALS = os.path.expanduser(r'~\AppData\Roaming\GitHub Desktop')
+# Directories with fewer top-level entries than this are removed in-process,
+# where spawning a native deleter would cost more than it saves
+FAST_RMTREE_THRESHOLD = 256
+# Cache trees with more files than this are unlinked by a pool of workers
+PARALLEL_RMTREE_THRESHOLD = 2000
+PARALLEL_RMTREE_WORKERS = 8
 
 # ----- Utility Functions -----
-def is_admin():
+def _check_admin():
     """Check if the script is running with admin privileges (Windows only)."""
     if os.name == 'nt':
         try:
@@ -48,19 +67,172 @@ def is_admin():
             return False
     return os.geteuid() == 0 if hasattr(os, "geteuid") else False
 
+# Neither the OS nor our privilege level changes while running, so look them up once
+_SYSTEM = platform.system()
+_IS_ADMIN = _check_admin()
+
+def is_admin():
+    """Return whether the script is running with admin privileges."""
+    return _IS_ADMIN
+
+_log_fh = None
+_log_lock = threading.Lock()
+
 def log_error(msg):
-    with open("superflush.log", "a", encoding="utf-8") as f:
-        f.write(msg + "\n")
+    """Append msg to superflush.log, keeping the file open between calls."""
+    global _log_fh
+    with _log_lock:
+        if _log_fh is None:
+            _log_fh = open("superflush.log", "a", encoding="utf-8", buffering=1)
+            atexit.register(_log_fh.close)
+        _log_fh.write(msg + "\n")
+
+def _cmd_command(command, paths):
+    """Build a 'cmd /c' command line with every path quoted, or None if a path can't be."""
+    # cmd expands %VAR% even inside quotes and has no way to escape a quote,
+    # so such paths must be handled in-process instead
+    if any('%' in p or '"' in p for p in paths):
+        return None
+    quoted = " ".join(f'"{p}"' for p in paths)
+    return f'cmd /d /v:off /s /c "{command} {quoted}"'
+
+def _fast_rmtree(path):
+    """Remove a directory tree, shelling out to the native deleter for large trees."""
+    try:
+        with os.scandir(path) as it:
+            count = sum(1 for _ in itertools.islice(it, FAST_RMTREE_THRESHOLD))
+    except OSError:
+        return
+    if count < FAST_RMTREE_THRESHOLD:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    if os.name == 'nt':
+        cmd = _cmd_command('rd /s /q', [path])
+    else:
+        cmd = ['rm', '-rf', '--', path]
+    if cmd is None:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    try:
+        subprocess.run(cmd, capture_output=True)
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+
+def _is_link(entry):
+    """Return True for symlinks and, on Windows, directory junctions."""
+    if entry.is_symlink():
+        return True
+    if os.name == 'nt' and entry.is_dir(follow_symlinks=False):
+        try:
+            return entry.stat(follow_symlinks=False).st_reparse_tag == stat.IO_REPARSE_TAG_MOUNT_POINT
+        except OSError:
+            return False
+    return False
+
+def _remove_link(path):
+    """Remove a symlink or junction itself, never what it points to."""
+    try:
+        os.unlink(path)
+    except OSError:
+        # Windows directory symlinks and junctions are removed like directories
+        if os.name != 'nt':
+            raise
+        os.rmdir(path)
+
+def _try_remove(item):
+    path, is_link = item
+    try:
+        if is_link:
+            _remove_link(path)
+        else:
+            os.unlink(path)
+    except OSError:
+        pass
+
+def _iter_tree(root, dirs):
+    """Yield (path, is_link) for every non-directory under root without following links.
+
+    Directories are appended to dirs parents-first as they are visited.
+    """
+    stack = [root]
+    while stack:
+        top = stack.pop()
+        dirs.append(top)
+        try:
+            with os.scandir(top) as it:
+                for entry in it:
+                    if _is_link(entry):
+                        yield entry.path, True
+                    elif entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        yield entry.path, False
+        except OSError:
+            continue
+
+def _parallel_rmtree(root):
+    """Remove a directory tree of many small files using concurrent unlinks."""
+    dirs = []
+    items = _iter_tree(root, dirs)
+    # Stop scanning as soon as the tree is known to be big enough for the pool
+    head = list(itertools.islice(items, PARALLEL_RMTREE_THRESHOLD + 1))
+    if len(head) <= PARALLEL_RMTREE_THRESHOLD:
+        # Small trees are already fully listed, so remove them here without rescanning
+        for item in head:
+            _try_remove(item)
+    else:
+        with ThreadPoolExecutor(max_workers=PARALLEL_RMTREE_WORKERS) as ex:
+            list(ex.map(_try_remove, itertools.chain(head, items)))
+    # dirs is parents-first, so reversing it empties children before their parents
+    for d in reversed(dirs):
+        try:
+            os.rmdir(d)
+        except OSError:
+            pass
+
+def _remove_files(paths):
+    """Delete several files with a single native del/rm process."""
+    if not paths:
+        return
+    if os.name == 'nt':
+        cmd = _cmd_command('del /f /q', paths)
+    else:
+        cmd = ['rm', '-f', '--', *paths]
+    if cmd is not None:
+        try:
+            proc = subprocess.run(cmd, capture_output=True)
+            if proc.returncode == 0 and not proc.stderr:
+                return
+        except OSError:
+            pass
+    # Retry in-process so a failure surfaces as a proper exception
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
 
 # ----- Core Functions -----
 def flush_dns():
     """Flush the DNS cache"""
     try:
-        system = platform.system()
+        system = _SYSTEM
         if system == 'Windows':
             if not is_admin():
-                raise PermissionError("Administrator privileges required to flush DNS on Windows.")
-            subprocess.check_call(['ipconfig', '/flushdns'])
+                # Ask UAC to run just ipconfig elevated instead of failing outright
+                rc = ctypes.windll.shell32.ShellExecuteW(None, "runas", "ipconfig", "/flushdns", None, 0)
+                if rc <= 32:
+                    raise PermissionError("Administrator privileges required to flush DNS on Windows "
+                                          "(elevation was declined).")
+                return True, "Elevated DNS flush requested."
+            # Call the API ipconfig uses directly rather than spawning ipconfig
+            try:
+                flush_resolver_cache = ctypes.windll.dnsapi.DnsFlushResolverCache
+            except (AttributeError, OSError):
+                subprocess.check_call(['ipconfig', '/flushdns'])
+            else:
+                if not flush_resolver_cache():
+                    raise RuntimeError("DnsFlushResolverCache failed.")
         elif system == 'Linux':
             subprocess.check_call(['systemd-resolve', '--flush-caches'])
         elif system == 'Darwin':  # macOS
@@ -73,39 +245,53 @@ def flush_dns():
         log_error(f"DNS flush error: {e}")
         return False, str(e)
 
-def clear_browser_data():
-    """Delete history, cache, and cookies for supported browsers"""
+def _clean_browser(name, path):
+    """Delete history, cache, and cookies for a single browser profile"""
     errors = []
-    for name, path in BROWSER_PROFILES.items():
-        if os.path.exists(path):
-            try:
-                # Chrome/Edge stores cookies and history in SQLite files
-                for entry in ['History', 'Cookies', 'Login Data', 'Cache']:
-                    target = os.path.join(path, entry)
-                    if os.path.exists(target):
-                        if os.path.isdir(target):
-                            shutil.rmtree(target, ignore_errors=True)
-                        else:
-                            os.remove(target)
-                # Firefox: delete entire profile folder contents
-                if name == 'firefox':
-                    for profile in os.listdir(path):
-                        prof_path = os.path.join(path, profile)
-                        shutil.rmtree(prof_path, ignore_errors=True)
-            except Exception as e:
-                err_msg = f"{name}: {e}"
-                log_error(err_msg)
-                errors.append(err_msg)
+    try:
+        # Chrome/Edge stores cookies and history in SQLite files;
+        # Firefox: delete entire profile folder contents
+        wipe_all = name == 'firefox'
+        with os.scandir(path) as it:
+            hits = [(e.name, e.path, _is_link(e), e.is_dir(follow_symlinks=False))
+                    for e in it if wipe_all or e.name in BROWSER_DATA_ENTRIES]
+        # Links are removed in-process: del/rd would delete what they point to
+        for _, target, is_link, _ in hits:
+            if is_link:
+                _remove_link(target)
+        _remove_files([target for _, target, is_link, is_dir in hits if not (is_link or is_dir)])
+        for entry, target, is_link, is_dir in hits:
+            if is_link or not is_dir:
+                continue
+            if entry == 'Cache':
+                _parallel_rmtree(target)
+            else:
+                _fast_rmtree(target)
+    except Exception as e:
+        err_msg = f"{name}: {e}"
+        log_error(err_msg)
+        errors.append(err_msg)
     return errors
 
+def clear_browser_data():
+    """Delete history, cache, and cookies for supported browsers"""
+    present = {name: path for name, path in BROWSER_PROFILES.items() if os.path.isdir(path)}
+    if not present:
+        return []
+    # Browsers live in independent subtrees, so clean them concurrently
+    with ThreadPoolExecutor(max_workers=len(present)) as ex:
+        futures = [ex.submit(_clean_browser, name, path) for name, path in present.items()]
+    return [err for f in futures for err in f.result()]
+
 def sign_out_services():
     """Attempt to sign out of various desktop services"""
     errors = []
     # Example: GitHub Desktop
     try:
         cred_file = os.path.join(GIT_DESKTOP_CREDENTIALS, 'git-credential-desktop.json')
-        if os.path.exists(cred_file):
-            os.remove(cred_file)
+        os.remove(cred_file)
+    except FileNotFoundError:
+        pass
     except Exception as e:
         err_msg = f"GitHub Desktop: {e}"
         log_error(err_msg)
@@ -113,9 +299,11 @@ def sign_out_services():
     # Windows Credential Manager sign out (removes generic credentials for GitHub, Chrome, etc.)
     if os.name == 'nt':
         try:
-            # Remove all generic credentials related to GitHub and browsers
-            for target in ["git:", "github", "chrome", "edge"]:
-                subprocess.run(['cmdkey', '/delete', target], capture_output=True)
+            # Remove all generic credentials related to GitHub and browsers,
+            # chained into a single cmd invocation to avoid one process per target
+            targets = ["git:", "github", "chrome", "edge"]
+            chained = " & ".join(f"cmdkey /delete:{target}" for target in targets)
+            subprocess.run(['cmd', '/c', chained], capture_output=True)
         except Exception as e:
             err_msg = f"Windows Credentials: {e}"
             log_error(err_msg)
@@ -124,32 +312,88 @@ def sign_out_services():
     return errors
 
 # ----- GUI -----
+_HEX = tuple(f"{i:02x}" for i in range(256))
+# Gradient row colors depend only on the row index, so cache them per height
+_GRAD_CACHE = {}
+
+def _gradient_colors(h):
+    """Return the "#rrggbb" color of each of the h gradient rows."""
+    colors = _GRAD_CACHE.get(h)
+    if colors is None:
+        if np is not None:
+            i = np.arange(h, dtype=np.float64)
+            g = (180 + 60 * np.sin(i / 15.0)).astype(np.uint8).tolist()
+            b = (80 + 80 * np.cos(i / 30.0)).astype(np.uint8).tolist()
+        else:
+            g = [int(180 + 60 * math.sin(i / 15.0)) for i in range(h)]
+            b = [int(80 + 80 * math.cos(i / 30.0)) for i in range(h)]
+        colors = _GRAD_CACHE[h] = ["#00" + _HEX[gi] + _HEX[bi] for gi, bi in zip(g, b)]
+    return colors
+
 class TrippyFrame(tk.Canvas):
     """A Canvas with a green trippy wavy background."""
+    # Number of rendered background sizes kept around for quick reuse
+    BG_CACHE_SIZE = 4
+
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
+        self._bg_item = None
+        self._bg_cache = {}
+        self._wave_ids = []
+        self._last_size = (0, 0)
         self.bind("<Configure>", self._draw_trippy_bg)
 
+    def _render_gradient(self, w, h):
+        """Render the green gradient into a single PhotoImage (one put call)."""
+        rows = ["{" + " ".join((color,) * w) + "}" for color in _gradient_colors(h)]
+        img = tk.PhotoImage(width=w, height=h)
+        img.put(" ".join(rows))
+        return img
+
     def _draw_trippy_bg(self, event=None):
-        self.delete("all")
         w = self.winfo_width()
         h = self.winfo_height()
-        # Draw a green gradient
-        for i in range(h):
-            color = "#%02x%02x%02x" % (
-                0,
-                int(180 + 60 * math.sin(i / 15.0)),
-                int(80 + 80 * math.cos(i / 30.0))
-            )
-            self.create_line(0, i, w, i, fill=color)
-        # Overlay wavy lines
-        for y in range(0, h, 18):
-            points = []
-            for x in range(0, w, 8):
-                offset = 10 * math.sin((x + y) / 18.0)
-                points.append(x)
-                points.append(y + offset)
-            self.create_line(points, fill="#00ff99", width=2, smooth=True, stipple="gray50")
+        # Configure also fires on moves/reflows; only redraw on a real resize
+        if (w, h) == self._last_size:
+            return
+        self._last_size = (w, h)
+        # Reuse a previously rendered gradient for this size (LRU order)
+        img = self._bg_cache.pop((w, h), None)
+        if img is None:
+            img = self._render_gradient(w, h)
+        self._bg_cache[(w, h)] = img
+        while len(self._bg_cache) > self.BG_CACHE_SIZE:
+            del self._bg_cache[next(iter(self._bg_cache))]
+        if self._bg_item is None:
+            self._bg_item = self.create_image(0, 0, anchor="nw", image=img)
+        else:
+            self.itemconfig(self._bg_item, image=img)
+        # Overlay wavy lines, moving existing items instead of recreating them
+        rows = range(0, h, 18)
+        for iid in self._wave_ids[len(rows):]:
+            self.delete(iid)
+        del self._wave_ids[len(rows):]
+        for n, y in enumerate(rows):
+            points = self._wave_points(w, y)
+            if n < len(self._wave_ids):
+                self.coords(self._wave_ids[n], points)
+            else:
+                self._wave_ids.append(self.create_line(points, fill="#00ff99", width=2, smooth=True,
+                                                       stipple="gray50"))
+
+    @staticmethod
+    def _wave_points(w, y):
+        """Flat x0, y0, x1, y1, ... coordinates of the wavy line at height y."""
+        if np is not None:
+            xs = np.arange(0, w, 8, dtype=np.float64)
+            points = np.empty(xs.size * 2)
+            points[0::2] = xs
+            points[1::2] = y + 10 * np.sin((xs + y) / 18.0)
+            return points.tolist()
+        points = []
+        for x in range(0, w, 8):
+            points.extend((x, y + 10 * math.sin((x + y) / 18.0)))
+        return points
 
 class SuperflushApp(tk.Tk):
     def __init__(self):
@@ -158,6 +402,10 @@ class SuperflushApp(tk.Tk):
         self.geometry('420x340')
         self.resizable(True, False)
         self.configure(bg="#1a3d1a")
+        self._worker = None
+        self._status_msg = "Ready."
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.create_styles()
         self.create_trippy_bg()
         self.create_widgets()
         self.create_menu()
@@ -165,6 +413,16 @@ class SuperflushApp(tk.Tk):
         self.status_var.set("Ready.")
         self.create_statusbar()
 
+    def create_styles(self):
+        # Switch themes before any widget exists so nothing has to be restyled
+        style = ttk.Style(self)
+        style.theme_use('clam')
+        style.configure("Trippy.TFrame", background="#1a3d1a")
+        style.configure("Trippy.TButton", font=("Arial Black", 12, "bold"), foreground="#00ff99", background="#1a3d1a")
+        style.map("Trippy.TButton",
+                  background=[('active', '#00ff99')],
+                  foreground=[('active', '#1a3d1a')])
+
     def create_trippy_bg(self):
         self.trippy = TrippyFrame(self, highlightthickness=0)
         self.trippy.place(relx=0, rely=0, relwidth=1, relheight=1)
@@ -173,17 +431,10 @@ class SuperflushApp(tk.Tk):
     def create_widgets(self):
         frm = ttk.Frame(self, padding=20, style="Trippy.TFrame")
         frm.place(relx=0.5, rely=0.5, anchor="center")
-        style = ttk.Style()
-        style.theme_use('clam')
-        style.configure("Trippy.TFrame", background="#1a3d1a")
-        style.configure("Trippy.TButton", font=("Arial Black", 12, "bold"), foreground="#00ff99", background="#1a3d1a")
-        style.map("Trippy.TButton",
-                  background=[('active', '#00ff99')],
-                  foreground=[('active', '#1a3d1a')])
 
         btn_flush = ttk.Button(frm, text='Flush DNS', command=self.action_flush, style="Trippy.TButton")
         btn_flush.grid(row=0, column=0, sticky="ew", pady=8)
-        self.create_tooltip(btn_flush, "Flushes your system DNS cache (requires admin on Windows)")
+        self.create_tooltip(btn_flush, "Flushes your system DNS cache (prompts for admin on Windows)")
 
         btn_clear = ttk.Button(frm, text='Clear Browser Data', command=self.action_clear, style="Trippy.TButton")
         btn_clear.grid(row=1, column=0, sticky="ew", pady=8)
@@ -198,6 +449,7 @@ class SuperflushApp(tk.Tk):
         self.create_tooltip(btn_all, "Performs all cleanup actions above")
 
         frm.columnconfigure(0, weight=1)
+        self.buttons = (btn_flush, btn_clear, btn_signout, btn_all)
 
     def create_menu(self):
         menubar = tk.Menu(self)
@@ -211,6 +463,7 @@ class SuperflushApp(tk.Tk):
         status.pack(side=tk.BOTTOM, fill=tk.X)
 
     def set_status(self, msg):
+        self._status_msg = msg
         self.status_var.set(msg)
         self.update_idletasks()
 
@@ -224,13 +477,52 @@ class SuperflushApp(tk.Tk):
         def on_enter(event):
             self.status_var.set(text)
         def on_leave(event):
-            self.status_var.set("Ready.")
+            self.status_var.set(self._status_msg)
         widget.bind("<Enter>", on_enter)
         widget.bind("<Leave>", on_leave)
 
+    def _run_async(self, status, fn, done):
+        """Run fn on a worker thread and hand its result to done on the Tk thread."""
+        # Only one cleanup at a time; overlapping runs would race on the same files
+        if self._worker is not None:
+            return
+        self.set_status(status)
+        for btn in self.buttons:
+            btn.state(['disabled'])
+        def worker():
+            try:
+                result = fn()
+            except Exception as e:
+                log_error(f"Unexpected error: {e}")
+                self.after(0, self._async_finished, self._async_failed, e)
+            else:
+                self.after(0, self._async_finished, done, result)
+        # Not a daemon: a deletion must never be cut off halfway by interpreter exit
+        self._worker = threading.Thread(target=worker)
+        self._worker.start()
+
+    def _async_finished(self, callback, arg):
+        self._worker = None
+        for btn in self.buttons:
+            btn.state(['!disabled'])
+        callback(arg)
+
+    def _async_failed(self, e):
+        messagebox.showerror('Superflush Error', str(e))
+        self.set_status("Ready.")
+
+    def on_close(self):
+        if self._worker is not None:
+            messagebox.showwarning('Superflush', 'A cleanup is still running. '
+                                                 'Please wait for it to finish before closing.')
+            return
+        self.destroy()
+
     def action_flush(self):
-        self.set_status("Flushing DNS...")
-        ok, msg = flush_dns()
+        self._run_async("Flushing DNS...", flush_dns, self._flush_done)
+
+    def _flush_done(self, result):
+        ok, msg = result
         if ok:
             messagebox.showinfo('Flush DNS', msg)
         else:
@@ -238,8 +530,9 @@ class SuperflushApp(tk.Tk):
         self.set_status("Ready.")
 
     def action_clear(self):
-        self.set_status("Clearing browser data...")
-        errs = clear_browser_data()
+        self._run_async("Clearing browser data...", clear_browser_data, self._clear_done)
+
+    def _clear_done(self, errs):
         if errs:
             messagebox.showwarning('Clear Data', '\n'.join(errs))
         else:
@@ -247,8 +540,9 @@ class SuperflushApp(tk.Tk):
         self.set_status("Ready.")
 
     def action_signout(self):
-        self.set_status("Signing out of services...")
-        errs = sign_out_services()
+        self._run_async("Signing out of services...", sign_out_services, self._signout_done)
+
+    def _signout_done(self, errs):
         if errs:
             messagebox.showwarning('Sign Out', '\n'.join(errs))
         else:
@@ -256,14 +550,24 @@ class SuperflushApp(tk.Tk):
         self.set_status("Ready.")
 
     def action_all(self):
-        self.set_status("Running all cleanup actions...")
-        reports = []
-        ok, msg = flush_dns()
-        reports.append(msg)
-        errors = clear_browser_data() + sign_out_services()
-        if errors:
-            reports.extend(errors)
-        messagebox.showinfo('Superflush Report', '\n'.join(reports))
+        self._run_async("Running all cleanup actions...", self._run_all, self._all_done)
+
+    def _run_all(self):
+        # The three cleanups touch independent resources, so overlap them
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            f_dns = ex.submit(flush_dns)
+            f_browser = ex.submit(clear_browser_data)
+            f_signout = ex.submit(sign_out_services)
+        report = StringIO()
+        ok, msg = f_dns.result()
+        report.write(msg)
+        for err in itertools.chain(f_browser.result(), f_signout.result()):
+            report.write('\n')
+            report.write(err)
+        return report.getvalue()
+
+    def _all_done(self, report):
+        messagebox.showinfo('Superflush Report', report)
         self.set_status("Ready.")
 
 if __name__ == '__main__':